@@ -4,12 +4,54 @@ import matplotlib.pyplot as plt
 import numpy as np
 from . import util
 import cv2
-from scipy.interpolate import interp1d
 import os
 import xml.etree.ElementTree as elemTree
 
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
+# green reward interpolation points (dist to pin, reward)
+_GREEN_XP = np.array([0, 1, 3, 15, 100], dtype=np.float64)
+_GREEN_FP = np.array([-1, -1, -2, -3, -3], dtype=np.float64)
+
+
+def _render_state_img(img_gray_flipped, cx, cy, cos_a, sin_a, stride, offset_h, out, bg):
+    """
+    sample img_gray_flipped into out, seen from moving frame at (cx, cy) heading (cos_a, sin_a)
+    :param offset_h: moving frame x of the bottom row of out, in state img pixels
+    :param bg: intensity of samples falling outside img_gray_flipped
+    :return: out
+    """
+    h, w = out.shape
+    cos_a *= stride
+    sin_a *= stride
+
+    # moving frame coords of out pixel (u, v) are (y1_0 - v, x1_0 - u) scaled by stride
+    y1_0 = h - 1 + offset_h
+    x1_0 = int(w / 2) - 1
+
+    # affine map from out pixel (u, v) to img_gray_flipped pixel (x0, y0)
+    tf = np.array([
+        [sin_a, -cos_a, cx + cos_a * y1_0 - sin_a * x1_0],
+        [-cos_a, -sin_a, cy + sin_a * y1_0 + cos_a * x1_0]
+    ])
+
+    return cv2.warpAffine(img_gray_flipped, tf, (w, h), dst=out,
+                          flags=cv2.INTER_NEAREST | cv2.WARP_INVERSE_MAP,
+                          borderMode=cv2.BORDER_CONSTANT,
+                          borderValue=bg)
+
+
+def _render_state_img_batch(img_gray_flipped, cxs, cys, cos_as, sin_as, stride, offset_h, out, bg):
+    """
+    batch version of _render_state_img sampling n moving frames into out of shape (n, h, w)
+    every frame goes through the same warpAffine kernel so batched and single env state imgs are identical
+    :return: out
+    """
+    for i in range(len(out)):
+        _render_state_img(img_gray_flipped, cxs[i], cys[i], cos_as[i], sin_as[i], stride, offset_h, out[i], bg)
+
+    return out
+
 
 class GolfEnv:
     class NoAreaInfoAssignedException(Exception):
@@ -35,6 +77,9 @@ class GolfEnv:
             return 'Error parsing config. File' + str(self.path) + ' seems to be corrupted.'
 
     class State:
+        __slots__ = ('dist_to_pin', 'dist_to_tee', 'state_img', 'ball_pos', 'landed_pixel_intensity',
+                     'club_availability', 'last_step_reward', 'debug_str')
+
         def __init__(self):
             self.dist_to_pin = None
             self.dist_to_tee = None
@@ -65,17 +110,12 @@ class GolfEnv:
         DEV_Y = 3
         IS_DIST_PROPER = 4
 
-    _IMG_PATH_GRAY = ''
-    _IMG_PATH_COLOR = ''
     _IMG_SIZE = np.array([500, 500])
     _IMG_SAMPLING_STRIDE = 1 * 3.571
-    _TEE_POS = np.array([256, 116])
-    _PIN_POS = np.array([280, 430])
     _STATE_IMAGE_WIDTH = 84
     _STATE_IMAGE_HEIGHT = 84
     _STATE_IMAGE_OFFSET_HEIGHT = -20 / 3.571
     _OUT_OF_IMG_INTENSITY = 0
-    _ARGS = ''
     _POSSIBLE_INIT_POS_AREAS = ('GREEN', 'FAIRWAY', 'ROUGH', 'SAND')
 
     # temporally disable Pycharm formatter for better readability
@@ -85,7 +125,7 @@ class GolfEnv:
         # PIXL  NAME        K_DIST  K_DEV   ON_LAND                 TERM    RWRD(d: dist to pin)
         -1:     ('TEE',     1.0,    1.0,    OnLandAction.NONE,      False,  lambda d: -1),
         70:     ('FAIRWAY', 1.0,    1.0,    OnLandAction.NONE,      False,  lambda d: -1),
-        80:     ('GREEN',   1.0,    1.0,    OnLandAction.NONE,      True,   lambda d: -1 + interp1d([0, 1, 3, 15, 100], [-1, -1, -2, -3, -3])(d)),
+        80:     ('GREEN',   1.0,    1.0,    OnLandAction.NONE,      True,   lambda d: -1 + np.interp(d, _GREEN_XP, _GREEN_FP)),
         50:     ('SAND',    0.6,    1.5,    OnLandAction.NONE,      False,  lambda d: -1),
         5:      ('WATER',   0.4,    1.0,    OnLandAction.SHORE,     False,  lambda d: -2),
         55:     ('ROUGH',   0.8,    1.5,    OnLandAction.NONE,      False,  lambda d: -1),
@@ -119,37 +159,18 @@ class GolfEnv:
     # @formatter:on
 
     def __init__(self, map_name):
-        # parse map config xml
-        xml_path = os.path.join(os.path.dirname(__file__), '../configs', map_name + '.xml')
-        tree = elemTree.parse(xml_path)
-
-        try:
-            self._IMG_PATH_GRAY = os.path.join(os.path.dirname(__file__), '..', tree.find('./img_path_gray').text)
-            self._IMG_PATH_COLOR = os.path.join(os.path.dirname(__file__), '..', tree.find('./img_path_color').text)
-            self._TEE_POS = np.array([
-                int(tree.find('./tee/x').text),
-                int(tree.find('./tee/y').text)
-            ])
-            self._PIN_POS = np.array([
-                int(tree.find('./pin/x').text),
-                int(tree.find('./pin/y').text)
-            ])
-
-            if tree.find('./args') is not None:
-                self._ARGS = tree.find('./args').text
-
-        except AttributeError:
-            raise self.MapConfigParseException(xml_path)
-
+        self._map = GolfMap(map_name)
+        self._rng = np.random.default_rng()
         self._step_n = 0
         self._max_step_n = -1
-        self._ball_path_x = []
-        self._ball_path_y = []
+        # ball path for plotting, rows [:self._ball_path_n] are valid and buffer grows when full
+        self._ball_path = np.empty((64, 2))
+        self._ball_path_n = 0
         self._state = self.State()
-        self._img_color = cv2.resize(cv2.cvtColor(cv2.imread(self._IMG_PATH_COLOR), cv2.COLOR_BGR2RGB),
-                                     dsize=(500, 500), interpolation=cv2.INTER_AREA)
-        self._img_gray = cv2.cvtColor(cv2.imread(self._IMG_PATH_GRAY), cv2.COLOR_BGR2GRAY)
-        self._rng = np.random.default_rng()
+        # buffers reused every step to avoid per-step allocations
+        self._state.ball_pos = np.zeros(2)
+        self._new_ball_pos = np.zeros(2)
+        self._shoot = np.zeros(2)
         self._keyframes = []
         self._animation_path = ''
 
@@ -172,9 +193,8 @@ class GolfEnv:
 
         self._max_step_n = max_timestep
         self._step_n = 0
-        self._state.ball_pos = self._TEE_POS
+        self._state.ball_pos[:] = self._map.tee_pos
         self._state.club_availability = np.ones(len(GolfEnv.SKILL_MODEL))
-        self._state.area_info = GolfEnv.AREA_INFO[self.__get_pixel_on(self._TEE_POS)]
         self._state.last_step_reward = 0.0
         self._animation_path = animation_path
 
@@ -187,7 +207,7 @@ class GolfEnv:
 
         # set initial pose when initial_pos is not None
         if initial_pos is not None:
-            pixel = self.__get_pixel_on(initial_pos)
+            pixel = self._map.get_pixel_on(initial_pos)
 
             if pixel not in GolfEnv.AREA_INFO:
                 raise GolfEnv.NoAreaInfoAssignedException(pixel)
@@ -197,14 +217,13 @@ class GolfEnv:
             if area_name not in self._POSSIBLE_INIT_POS_AREAS:
                 raise GolfEnv.InvalidInitialPosException(initial_pos, area_name)
 
-            self._state.area_info = area_info
-            self._state.ball_pos = initial_pos
+            self._state.ball_pos[:] = initial_pos
 
         # randomize initial pose when randomize_initial_pos is True
         if randomize_initial_pos:
             while True:
                 rand_pos = np.random.randint([0, 0], self._IMG_SIZE)
-                pixel = self.__get_pixel_on(rand_pos)
+                pixel = self._map.get_pixel_on(rand_pos)
 
                 if pixel not in GolfEnv.AREA_INFO:
                     raise GolfEnv.NoAreaInfoAssignedException(pixel)
@@ -214,17 +233,17 @@ class GolfEnv:
                 if area_name in self._POSSIBLE_INIT_POS_AREAS:
                     break
 
-            self._state.area_info = area_info
-            self._state.ball_pos = rand_pos
+            self._state.ball_pos[:] = rand_pos
 
         # get ball pos, dist_to_pin, dist_to_tee
-        self._state.dist_to_pin = np.linalg.norm(self._state.ball_pos - self._PIN_POS)
-        self._state.dist_to_tee = np.linalg.norm(self._state.ball_pos - self._TEE_POS)
-        self._state.state_img = self.__generate_state_img(self._state.ball_pos)
-        self._state.landed_pixel_intensity = self.__get_pixel_on(self._state.ball_pos)
+        ball_x, ball_y = self._state.ball_pos
+        self._state.dist_to_pin = math.hypot(ball_x - self._map.pin_x, ball_y - self._map.pin_y)
+        self._state.dist_to_tee = math.hypot(ball_x - self._map.tee_x, ball_y - self._map.tee_y)
+        self._state.state_img = self._map.generate_state_img(self._state.ball_pos)
+        self._state.landed_pixel_intensity = self._map.get_pixel_on(self._state.ball_pos)
 
-        self._ball_path_x = [self._state.ball_pos[0]]
-        self._ball_path_y = [self._state.ball_pos[1]]
+        self._ball_path_n = 0
+        self.__append_ball_path(self._state.ball_pos)
 
         if self._animation_path != '':
             self._keyframes.append(self.paint())
@@ -258,14 +277,12 @@ class GolfEnv:
             debug_club_name += ' (X)'
 
         else:
-            # get area info, dist_coef, dev_coef
-            self._state.area_info = GolfEnv.AREA_INFO[self._state.landed_pixel_intensity]
-            dist_coef = self._state.area_info[self.AreaInfoIndex.DIST_COEF]
-            dev_coef = math.sqrt(self._state.area_info[self.AreaInfoIndex.DEV_COEF])
+            # get dist_coef, dev_coef of landed area
+            dist_coef = self._map.dist_coef[self._state.landed_pixel_intensity]
+            dev_coef = math.sqrt(self._map.dev_coef[self._state.landed_pixel_intensity])
 
             # get club info, distance, devs, reduced_dist
-            self._state.club_info = GolfEnv.SKILL_MODEL[action[1]]
-            club_name, club_distance, dev_x, dev_y, _ = self._state.club_info
+            club_name, club_distance, dev_x, dev_y, _ = GolfEnv.SKILL_MODEL[action[1]]
             reduced_dist = club_distance * dist_coef
 
             # nullify deviations if accurate_shots option is on
@@ -273,82 +290,77 @@ class GolfEnv:
                 dev_coef = 0.0
 
             # get tf delta of (x,y)
-            angle_to_pin = math.atan2(self._PIN_POS[1] - self._state.ball_pos[1],
-                                      self._PIN_POS[0] - self._state.ball_pos[0])
-            shoot = np.array([[reduced_dist, 0]]) + self._rng.normal(
-                size=2,
-                scale=[dev_x * dev_coef, dev_y * dev_coef]
-            )
-            delta = np.dot(util.rotation_2d(util.deg_to_rad(action[0]) + angle_to_pin), shoot.transpose()).transpose()
-
-            # offset tf by delta to derive new ball pose
-            new_ball_pos = np.array([self._state.ball_pos[0] + delta[0][0], self._state.ball_pos[1] + delta[0][1]])
+            ball_x, ball_y = self._state.ball_pos
+            angle_to_pin = math.atan2(self._map.pin_y - ball_y, self._map.pin_x - ball_x)
+            shoot = self._rng.standard_normal(out=self._shoot)
+            shoot[0] = reduced_dist + shoot[0] * dev_x * dev_coef
+            shoot[1] *= dev_y * dev_coef
+            shoot_x, shoot_y = shoot
+            shoot_angle = util.deg_to_rad(action[0]) + angle_to_pin
+            cos_a = math.cos(shoot_angle)
+            sin_a = math.sin(shoot_angle)
+
+            # offset tf by rotated shoot to derive new ball pose
+            new_ball_pos = self._new_ball_pos
+            new_ball_pos[0] = new_ball_x = ball_x + cos_a * shoot_x - sin_a * shoot_y
+            new_ball_pos[1] = new_ball_y = ball_y + sin_a * shoot_x + cos_a * shoot_y
 
             # store position for plotting
-            self._ball_path_x.append(new_ball_pos[0])
-            self._ball_path_y.append(new_ball_pos[1])
+            self.__append_ball_path(new_ball_pos)
 
             # get landed pixel intensity, area info
-            new_pixel = self.__get_pixel_on(new_ball_pos)
-            if new_pixel not in GolfEnv.AREA_INFO:
+            new_pixel = self._map.get_pixel_on(new_ball_pos)
+            if not self._map.area_known[new_pixel]:
                 raise GolfEnv.NoAreaInfoAssignedException(new_pixel)
-            area_info = GolfEnv.AREA_INFO[new_pixel]
-            debug_area_name = area_info[GolfEnv.AreaInfoIndex.NAME]
+            debug_area_name = self._map.area_name[new_pixel]
 
             # get distance to ball
-            dist_to_pin = np.linalg.norm(new_ball_pos - self._PIN_POS)
-            dist_to_tee = np.linalg.norm(new_ball_pos - self._TEE_POS)
+            dist_to_pin = math.hypot(new_ball_x - self._map.pin_x, new_ball_y - self._map.pin_y)
+            dist_to_tee = math.hypot(new_ball_x - self._map.tee_x, new_ball_y - self._map.tee_y)
 
-            # get reward, termination from reward dict
-            reward = area_info[self.AreaInfoIndex.REWARD](dist_to_pin)
-            termination = area_info[self.AreaInfoIndex.TERMINATION]
+            # get reward, termination, on land action from area tables
+            reward = self._map.reward_func[new_pixel](dist_to_pin)
+            termination = bool(self._map.termination[new_pixel])
+            on_land = self._map.on_land[new_pixel]
 
-            if area_info[self.AreaInfoIndex.ON_LAND] == self.OnLandAction.NONE:
+            if on_land == self.OnLandAction.NONE:
                 # get state img
-                new_state_img = self.__generate_state_img(new_ball_pos)
+                new_state_img = self._map.generate_state_img(new_ball_pos)
                 # update state
-                self._state.area_info = area_info
                 self._state.state_img = new_state_img
                 self._state.dist_to_pin = dist_to_pin
                 self._state.dist_to_tee = dist_to_tee
-                self._state.ball_pos = new_ball_pos
+                self._state.ball_pos[:] = new_ball_pos
                 self._state.landed_pixel_intensity = new_pixel
 
-            elif area_info[self.AreaInfoIndex.ON_LAND] == self.OnLandAction.ROLLBACK:
+            elif on_land == self.OnLandAction.ROLLBACK:
                 # add previous position to scatter plot to indicate ball return when rolled back
-                self._ball_path_x.append(self._state.ball_pos[0])
-                self._ball_path_y.append(self._state.ball_pos[1])
-
-            elif self._state.area_info[self.AreaInfoIndex.ON_LAND] == self.OnLandAction.SHORE:
-                # get angle to move
-                from_pin_vector = np.array(
-                    [new_ball_pos[0] - self._PIN_POS[0],
-                     new_ball_pos[1] - self._PIN_POS[1]]
-                ).astype('float64')
-                from_pin_vector /= np.linalg.norm(from_pin_vector)
-
-                while True:
-                    new_ball_pos += from_pin_vector
-                    if not GolfEnv.AREA_INFO[self.__get_pixel_on(new_ball_pos)][
-                               self.AreaInfoIndex.ON_LAND] == self.OnLandAction.SHORE:
-                        break
+                self.__append_ball_path(self._state.ball_pos)
 
-                # get state img
-                new_state_img = self.__generate_state_img(new_ball_pos)
+            elif on_land == self.OnLandAction.SHORE:
+                # move ball away from pin to the first landable pixel
+                shore_poses, found = self._map.get_shore_poses(new_ball_pos[np.newaxis])
 
-                # recompute area info
-                area_info = GolfEnv.AREA_INFO[self.__get_pixel_on(new_ball_pos)]
+                if not found[0]:
+                    # roll back when there is no landable pixel behind the shore area
+                    self.__append_ball_path(self._state.ball_pos)
 
-                # update state
-                self._state.area_info = area_info
-                self._state.state_img = new_state_img
-                self._state.dist_to_pin = dist_to_pin
-                self._state.ball_pos = new_ball_pos
-                self._state.landed_pixel_intensity = new_pixel
+                else:
+                    new_ball_pos[:] = shore_poses[0]
+                    new_ball_x, new_ball_y = new_ball_pos
+
+                    # get state img
+                    new_state_img = self._map.generate_state_img(new_ball_pos)
 
-                # add current point to scatter plot to indicate on-landing action
-                self._ball_path_x.append(new_ball_pos[0])
-                self._ball_path_y.append(new_ball_pos[1])
+                    # update state
+                    self._state.state_img = new_state_img
+                    self._state.dist_to_pin = math.hypot(new_ball_x - self._map.pin_x, new_ball_y - self._map.pin_y)
+                    self._state.dist_to_tee = math.hypot(new_ball_x - self._map.tee_x, new_ball_y - self._map.tee_y)
+                    self._state.ball_pos[:] = new_ball_pos
+                    self._state.landed_pixel_intensity = self._map.get_pixel_on(new_ball_pos)
+
+                    # add current point to scatter plot to indicate on-landing action
+                    self.__append_ball_path(new_ball_pos)
 
         # print debug
         self._state.debug_str = (
@@ -384,37 +396,27 @@ class GolfEnv:
         plt.ylabel('Y')
         plt.xlim([0, self._IMG_SIZE[0]])
         plt.ylim([0, self._IMG_SIZE[1]])
-        plt.imshow(plt.imread(self._IMG_PATH_GRAY), extent=[0, self._IMG_SIZE[0], 0, self._IMG_SIZE[1]])
-        plt.plot(self._ball_path_x, self._ball_path_y, marker='o', color="white")
+        plt.imshow(plt.imread(self._map.img_path_gray), extent=[0, self._IMG_SIZE[0], 0, self._IMG_SIZE[1]])
+        ball_path = self._ball_path[:self._ball_path_n]
+        plt.plot(ball_path[:, 0], ball_path[:, 1], marker='o', color="white")
 
         plt.show()
 
     def paint(self, draw_plot=False):
-        img = np.copy(self._img_color)
+        img = np.copy(self._map.img_color)
+
+        # ball path in img pixel coords
+        ball_path = self._ball_path[:self._ball_path_n].astype(int)
+        ball_path[:, 1] = self._IMG_SIZE[1] - 1 - ball_path[:, 1]
+        points = [tuple(point) for point in ball_path.tolist()]
 
         # draw dots
-        for i in range(len(self._ball_path_x)):
-            img = cv2.circle(
-                img,
-                (int(self._ball_path_x[i]),
-                 self._IMG_SIZE[1] - 1 - int(self._ball_path_y[i])),
-                3, (255, 255, 255), cv2.FILLED, cv2.LINE_8
-            )
+        for point in points:
+            img = cv2.circle(img, point, 3, (255, 255, 255), cv2.FILLED, cv2.LINE_8)
         # draw lines
-        for i in range(len(self._ball_path_x) - 1):
-            img = cv2.line(img,
-                           (int(self._ball_path_x[i]), self._IMG_SIZE[1] - 1 - int(self._ball_path_y[i])),
-                           (int(self._ball_path_x[i + 1]), self._IMG_SIZE[1] - 1 - int(self._ball_path_y[i + 1])),
-                           (219, 192, 50),
-                           2,
-                           cv2.LINE_AA)
-
-            img = cv2.line(img,
-                           (int(self._ball_path_x[i]), self._IMG_SIZE[1] - 1 - int(self._ball_path_y[i])),
-                           (int(self._ball_path_x[i + 1]), self._IMG_SIZE[1] - 1 - int(self._ball_path_y[i + 1])),
-                           (255, 255, 255),
-                           1,
-                           cv2.LINE_AA)
+        for i in range(len(points) - 1):
+            img = cv2.line(img, points[i], points[i + 1], (219, 192, 50), 2, cv2.LINE_AA)
+            img = cv2.line(img, points[i], points[i + 1], (255, 255, 255), 1, cv2.LINE_AA)
 
         if draw_plot:
             plt.figure(figsize=(10, 10))
@@ -431,45 +433,11 @@ class GolfEnv:
             availability[i] = int(GolfEnv.SKILL_MODEL[i][GolfEnv.ClubInfoIndex.IS_DIST_PROPER](dist))
         return availability
 
-    def __get_pixel_on(self, ball_pos):
-        x0 = int(round(ball_pos[0]))
-        y0 = int(round(ball_pos[1]))
-        if util.is_within([0, 0], [self._IMG_SIZE[0] - 1, self._IMG_SIZE[1] - 1], [x0, y0]):
-            return self._img_gray[-y0 - 1, x0]
-        else:
-            return self._OUT_OF_IMG_INTENSITY
-
-    def __generate_state_img(self, pos):
-        # get angle
-        angle_to_pin = math.atan2(self._PIN_POS[1] - pos[1], self._PIN_POS[0] - pos[0])
-
-        # get tf between fixed frame and moving frame (to use p0 = t01*p1)
-        t01 = util.transform_2d(pos[0], pos[1], angle_to_pin)
-
-        # generate image
-        state_img = np.zeros((self._STATE_IMAGE_HEIGHT, self._STATE_IMAGE_WIDTH), np.uint8)
-        state_img_y = 0
-
-        for y in range(
-                int(self._STATE_IMAGE_OFFSET_HEIGHT),
-                self._STATE_IMAGE_HEIGHT + int(self._STATE_IMAGE_OFFSET_HEIGHT)
-        ):
-            state_img_x = 0
-            for x in range(int(-self._STATE_IMAGE_WIDTH / 2), int(self._STATE_IMAGE_WIDTH / 2)):
-                p1 = np.array([y * self._IMG_SAMPLING_STRIDE, x * self._IMG_SAMPLING_STRIDE, 1])
-                p0 = np.dot(t01, p1)
-                x0 = int(round(p0[0]))
-                y0 = int(round(p0[1]))
-
-                if util.is_within([0, 0], [self._IMG_SIZE[0] - 1, self._IMG_SIZE[1] - 1], [x0, y0]):
-                    state_img[- state_img_y - 1, - state_img_x - 1] = self._img_gray[-y0 - 1, x0]
-                else:
-                    state_img[- state_img_y - 1, - state_img_x - 1] = self._OUT_OF_IMG_INTENSITY
-
-                state_img_x = state_img_x + 1
-            state_img_y = state_img_y + 1
-
-        return state_img
+    def __append_ball_path(self, pos):
+        if self._ball_path_n == len(self._ball_path):
+            self._ball_path = np.resize(self._ball_path, (2 * len(self._ball_path), 2))
+        self._ball_path[self._ball_path_n] = pos
+        self._ball_path_n += 1
 
     def get_state_metadata(self):
         return {
@@ -478,8 +446,18 @@ class GolfEnv:
             'debug_str': self._state.debug_str,
         }
 
+    def get_state_class_img(self):
+        """
+        state img with pixel intensities replaced by dense area class indices, e.g. for embedding layers
+        :return: uint8 img of class indices into get_area_class_names()
+        """
+        return self._map.area_class[self._state.state_img]
+
+    def get_area_class_names(self):
+        return tuple(self._map.area_class_names)
+
     def get_config_args(self):
-        return self._ARGS
+        return self._map.args
 
     def get_timestep(self):
         return self._step_n
@@ -487,3 +465,157 @@ class GolfEnv:
     @staticmethod
     def set_skill_model(skill_model):
         GolfEnv.SKILL_MODEL = skill_model
+
+
+class GolfMap:
+    """
+    map config, imgs and AREA_INFO lookup tables of a map, shared by GolfEnv and VectorGolfEnv
+    """
+    _IMG_CACHE = {}
+
+    def __init__(self, map_name):
+        # parse map config xml
+        xml_path = os.path.join(os.path.dirname(__file__), '../configs', map_name + '.xml')
+        tree = elemTree.parse(xml_path)
+
+        self.args = ''
+        try:
+            self.img_path_gray = os.path.join(os.path.dirname(__file__), '..', tree.find('./img_path_gray').text)
+            self.img_path_color = os.path.join(os.path.dirname(__file__), '..', tree.find('./img_path_color').text)
+            self.tee_pos = np.array([
+                int(tree.find('./tee/x').text),
+                int(tree.find('./tee/y').text)
+            ])
+            self.pin_pos = np.array([
+                int(tree.find('./pin/x').text),
+                int(tree.find('./pin/y').text)
+            ])
+
+            if tree.find('./args') is not None:
+                self.args = tree.find('./args').text
+
+        except AttributeError:
+            raise GolfEnv.MapConfigParseException(xml_path)
+
+        # tee, pin coords as python floats for scalar math in step
+        self.tee_x, self.tee_y = float(self.tee_pos[0]), float(self.tee_pos[1])
+        self.pin_x, self.pin_y = float(self.pin_pos[0]), float(self.pin_pos[1])
+
+        self.img_color, self.img_gray_flipped = self._load_imgs(self.img_path_color, self.img_path_gray)
+        self.state_img_shape = (GolfEnv._STATE_IMAGE_HEIGHT, GolfEnv._STATE_IMAGE_WIDTH)
+
+        # AREA_INFO as lookup tables indexed by pixel intensity
+        self.area_known = np.zeros(256, bool)
+        self.area_name = [''] * 256
+        self.dist_coef = np.ones(256)
+        self.dev_coef = np.ones(256)
+        self.on_land = np.zeros(256, np.uint8)
+        self.termination = np.zeros(256, bool)
+        self.reward_func = [None] * 256
+        self.area_class = np.zeros(256, np.uint8)
+        self.area_class_names = []
+        for pixel, area_info in GolfEnv.AREA_INFO.items():
+            if 0 <= pixel < 256:
+                self.area_known[pixel] = True
+                self.area_class[pixel] = len(self.area_class_names)
+                self.area_class_names.append(area_info[GolfEnv.AreaInfoIndex.NAME])
+                self.area_name[pixel] = area_info[GolfEnv.AreaInfoIndex.NAME]
+                self.dist_coef[pixel] = area_info[GolfEnv.AreaInfoIndex.DIST_COEF]
+                self.dev_coef[pixel] = area_info[GolfEnv.AreaInfoIndex.DEV_COEF]
+                self.on_land[pixel] = area_info[GolfEnv.AreaInfoIndex.ON_LAND]
+                self.termination[pixel] = area_info[GolfEnv.AreaInfoIndex.TERMINATION]
+                self.reward_func[pixel] = area_info[GolfEnv.AreaInfoIndex.REWARD]
+        # pixels with no area info fall into the class of out of img pixels
+        self.area_class[~self.area_known] = self.area_class[GolfEnv._OUT_OF_IMG_INTENSITY]
+
+        # mask of pixels the ball can be moved to from shore areas, and sample count for a ray to cross the whole img
+        self._landable_mask = (self.area_known & (self.on_land == GolfEnv.OnLandAction.NONE))[self.img_gray_flipped]
+        self._ray_t = np.arange(1, int(math.ceil(np.linalg.norm(GolfEnv._IMG_SIZE))) + 2)
+
+    def get_pixel_on(self, ball_pos):
+        x0 = int(round(ball_pos[0]))
+        y0 = int(round(ball_pos[1]))
+        if util.is_within_2d(GolfEnv._IMG_SIZE[0], GolfEnv._IMG_SIZE[1], x0, y0):
+            return self.img_gray_flipped[y0, x0]
+        else:
+            return GolfEnv._OUT_OF_IMG_INTENSITY
+
+    def get_pixels_on(self, ball_poses):
+        """
+        vectorized get_pixel_on
+        :param ball_poses: array of shape (n, 2)
+        :return: uint8 array of n pixel intensities
+        """
+        x0 = np.rint(ball_poses[:, 0]).astype(int)
+        y0 = np.rint(ball_poses[:, 1]).astype(int)
+        within = (0 <= x0) & (x0 < GolfEnv._IMG_SIZE[0]) & (0 <= y0) & (y0 < GolfEnv._IMG_SIZE[1])
+        pixels = np.full(len(ball_poses), GolfEnv._OUT_OF_IMG_INTENSITY, np.uint8)
+        pixels[within] = self.img_gray_flipped[y0[within], x0[within]]
+        return pixels
+
+    def get_shore_poses(self, ball_poses):
+        """
+        move balls on shore areas away from pin to the first landable(known, no on land action) pixel
+        :param ball_poses: array of shape (n, 2)
+        :return: tuple of (moved poses, whether a landable pixel was found), poses are invalid where not found
+        """
+        # get angles to move
+        from_pin_vectors = ball_poses - self.pin_pos
+        from_pin_vectors /= np.linalg.norm(from_pin_vectors, axis=1, keepdims=True)
+
+        # sample pixels along all rays at once and jump to the first landable one
+        ray_x = np.rint(ball_poses[:, 0:1] + self._ray_t * from_pin_vectors[:, 0:1]).astype(int)
+        ray_y = np.rint(ball_poses[:, 1:2] + self._ray_t * from_pin_vectors[:, 1:2]).astype(int)
+        ray_within = ((0 <= ray_x) & (ray_x < GolfEnv._IMG_SIZE[0]) &
+                      (0 <= ray_y) & (ray_y < GolfEnv._IMG_SIZE[1]))
+        ray_landable = np.zeros(ray_x.shape, bool)
+        ray_landable[ray_within] = self._landable_mask[ray_y[ray_within], ray_x[ray_within]]
+        ray_i = np.argmax(ray_landable, axis=1)
+        found = ray_landable[np.arange(len(ball_poses)), ray_i]
+
+        return ball_poses + self._ray_t[ray_i][:, None] * from_pin_vectors, found
+
+    def generate_state_img(self, pos):
+        # get angle
+        angle_to_pin = math.atan2(self.pin_y - pos[1], self.pin_x - pos[0])
+
+        # generate image
+        state_img = np.empty(self.state_img_shape, np.uint8)
+        _render_state_img(self.img_gray_flipped, pos[0], pos[1], math.cos(angle_to_pin), math.sin(angle_to_pin),
+                          GolfEnv._IMG_SAMPLING_STRIDE, int(GolfEnv._STATE_IMAGE_OFFSET_HEIGHT), state_img,
+                          GolfEnv._OUT_OF_IMG_INTENSITY)
+
+        return state_img
+
+    def generate_state_imgs(self, poses):
+        """
+        batch version of generate_state_img
+        :param poses: array of shape (n, 2)
+        :return: uint8 array of n state imgs
+        """
+        angles_to_pin = np.arctan2(self.pin_y - poses[:, 1], self.pin_x - poses[:, 0])
+
+        state_imgs = np.empty((len(poses),) + self.state_img_shape, np.uint8)
+        _render_state_img_batch(self.img_gray_flipped, poses[:, 0], poses[:, 1],
+                                np.cos(angles_to_pin), np.sin(angles_to_pin), GolfEnv._IMG_SAMPLING_STRIDE,
+                                int(GolfEnv._STATE_IMAGE_OFFSET_HEIGHT), state_imgs, GolfEnv._OUT_OF_IMG_INTENSITY)
+
+        return state_imgs
+
+    @classmethod
+    def _load_imgs(cls, img_path_color, img_path_gray):
+        """
+        load map imgs once and share them between instances
+        :return: tuple of (color img resized to 500x500, gray img with row index matching y coordinate), read-only
+        """
+        key = (img_path_color, img_path_gray)
+        if key not in cls._IMG_CACHE:
+            img_color = cv2.resize(cv2.cvtColor(cv2.imread(img_path_color), cv2.COLOR_BGR2RGB),
+                                   dsize=(500, 500), interpolation=cv2.INTER_AREA)
+            img_gray = cv2.cvtColor(cv2.imread(img_path_gray), cv2.COLOR_BGR2GRAY)
+            img_gray_flipped = np.ascontiguousarray(np.flipud(img_gray))
+            img_color.flags.writeable = False
+            img_gray_flipped.flags.writeable = False
+            cls._IMG_CACHE[key] = (img_color, img_gray_flipped)
+
+        return cls._IMG_CACHE[key]
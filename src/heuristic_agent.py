@@ -3,18 +3,51 @@ import numpy as np
 
 
 class HeuristicAgent:
+    _PROPER_CLUBS_TABLE_MAX_DIST = 600
 
     def __init__(self):
-        pass
+        self._rng = np.random.default_rng()
+        self._skill_model = None
+        self._proper_clubs_table = []
 
-    # noinspection PyMethodMayBeStatic
     def step(self, state):
         dist_to_pin = state[1]
-        club_n = len(golf_env.GolfEnv.SKILL_MODEL)
 
-        while True:
-            club = np.random.randint(club_n)
-            if golf_env.GolfEnv.SKILL_MODEL[club][golf_env.GolfEnv.ClubInfoIndex.IS_DIST_PROPER](dist_to_pin):
-                break
+        # rebuild table when skill model has been replaced
+        if self._skill_model is not golf_env.GolfEnv.SKILL_MODEL:
+            self.__build_proper_clubs_table()
 
-        return np.random.uniform(-45, 45), club
+        # look up clubs proper for 1m bucket of dist_to_pin, evaluate directly when bucket is ambiguous
+        bucket = int(dist_to_pin)
+        clubs = None
+        if 0 <= bucket < len(self._proper_clubs_table):
+            clubs = self._proper_clubs_table[bucket]
+        if clubs is None:
+            clubs = self.__get_proper_clubs(dist_to_pin)
+
+        club = int(clubs[self._rng.integers(len(clubs))])
+
+        return self._rng.uniform(-45, 45), club
+
+    def __build_proper_clubs_table(self):
+        """
+        precompute proper clubs for every 1m bucket [d, d+1)
+        buckets whose proper clubs differ at d, d+0.5 or d+1 are left None to be evaluated on demand
+        exact as long as every IS_DIST_PROPER changes value at most once within a bucket,
+        which holds for threshold predicates like the default skill model's
+        """
+        self._skill_model = golf_env.GolfEnv.SKILL_MODEL
+        table_max_dist = self._PROPER_CLUBS_TABLE_MAX_DIST
+        proper_clubs = [self.__get_proper_clubs(d) for d in range(table_max_dist + 1)]
+        proper_clubs_mid = [self.__get_proper_clubs(d + 0.5) for d in range(table_max_dist)]
+        self._proper_clubs_table = [
+            proper_clubs[d] if (np.array_equal(proper_clubs[d], proper_clubs[d + 1]) and
+                                np.array_equal(proper_clubs[d], proper_clubs_mid[d])) else None
+            for d in range(table_max_dist)
+        ]
+
+    def __get_proper_clubs(self, dist):
+        return np.array([
+            i for i, club_info in enumerate(self._skill_model)
+            if club_info[golf_env.GolfEnv.ClubInfoIndex.IS_DIST_PROPER](dist)
+        ], dtype=np.int32)
@@ -4,9 +4,11 @@ import matplotlib.pyplot as plt
 import cv2
 import imageio
 
+_DEG2RAD = math.pi / 180.0
+
 
 def deg_to_rad(deg):
-    return deg / 180.0 * math.pi
+    return deg * _DEG2RAD
 
 
 def rotation_2d(rot):
@@ -21,12 +23,16 @@ def transform_2d(tr_x, tr_y, rot):
 
 
 def inv_transform_2d(tf):
-    assert (tf.shape == (3, 3))
-
-    rot = tf[:2, :2]
-    translation = tf[:2, 2:3]
-    inv = np.concatenate([rot.transpose(), np.dot(-rot.transpose(), translation)], 1)
-    inv = np.concatenate([inv, np.array([[0, 0, 1]])])
+    # closed form inverse of SE(2) tf [[R, t], [0, 1]] -> [[R^T, -R^T t], [0, 1]]
+    c, s, tr_x, tr_y = tf[0, 0], tf[1, 0], tf[0, 2], tf[1, 2]
+    inv = np.empty((3, 3))
+    inv[0, 0] = c
+    inv[0, 1] = s
+    inv[0, 2] = -(c * tr_x + s * tr_y)
+    inv[1, 0] = -s
+    inv[1, 1] = c
+    inv[1, 2] = s * tr_x - c * tr_y
+    inv[2] = (0, 0, 1)
     return inv
 
 
@@ -44,6 +50,10 @@ def is_within(bounds_min, bounds_max, x, include_equality=True):
     return True
 
 
+def is_within_2d(x_max, y_max, x, y):
+    return 0 <= x < x_max and 0 <= y < y_max
+
+
 def show_grayscale(img):
     plt.imshow(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
     plt.show()
@@ -0,0 +1,161 @@
+import numpy as np
+from . import golf_env
+
+
+class VectorGolfEnv:
+    """
+    n envs on the same map stepped in lockstep, with state imgs of all envs rendered in one batch
+    """
+
+    def __init__(self, map_name, n):
+        self._map = golf_env.GolfMap(map_name)
+        self._n = n
+        self._rng = np.random.default_rng()
+        self._step_ns = np.zeros(n, int)
+        self._max_step_ns = np.full(n, -1)
+        self._ball_poses = np.zeros((n, 2))
+        self._landed_pixels = np.zeros(n, np.uint8)
+        self._dists_to_pin = np.zeros(n)
+        self._club_availabilities = np.ones((n, 0))
+        self._state_imgs = np.zeros((n,) + self._map.state_img_shape, np.uint8)
+        self._last_step_rewards = np.zeros(n)
+        self._skill_model = None
+        self._skill_model_table = None
+
+    def reset(self, indices=None, max_timestep=-1):
+        """
+        reset envs to tee
+        :param indices: indices of envs to reset, all envs when None
+        :param max_timestep: terminates when step_n exceeds max_timestep, applied to the reset envs only
+        :return: tuple of initial states(imgs, dists, club availabilities) stacked along the first axis
+        """
+        if indices is None:
+            indices = np.arange(self._n)
+
+        self.__sync_skill_model()
+        self._max_step_ns[indices] = max_timestep
+        self._step_ns[indices] = 0
+        self._ball_poses[indices] = self._map.tee_pos
+        self._landed_pixels[indices] = self._map.get_pixels_on(self._ball_poses[indices])
+        self._dists_to_pin[indices] = np.linalg.norm(self._ball_poses[indices] - self._map.pin_pos, axis=1)
+        self._club_availabilities[indices] = 1
+        self._last_step_rewards[indices] = 0.0
+        self.__update_state_imgs(indices)
+
+        return self._state_imgs, self._dists_to_pin.copy(), self._club_availabilities.copy()
+
+    def step(self, actions, accurate_shots=False):
+        """
+        steps all envs
+        :param actions: array of shape (n, 2) with rows of (angle(deg), club index)
+        :param accurate_shots: nullify shot deviations
+        :return: tuple of transitions (s,r,term) stacked along the first axis
+        s:tuple of states(imgs, dists, club availabilities), r:rewards term:terminations
+        """
+        actions = np.asarray(actions)
+        clubs = actions[:, 1].astype(int)
+        self._step_ns += 1
+
+        # get dist_coefs, dev_coefs of landed areas
+        dist_coefs = self._map.dist_coef[self._landed_pixels]
+        dev_coefs = np.zeros(self._n) if accurate_shots else np.sqrt(self._map.dev_coef[self._landed_pixels])
+
+        # get club distances, devs
+        self.__sync_skill_model()
+        club_distances, dev_xs, dev_ys = self._skill_model_table[clubs].T
+
+        # sample shoots and rotate them towards the pin offset by action angle
+        shoots = self._rng.standard_normal((self._n, 2))
+        shoots[:, 0] = club_distances * dist_coefs + shoots[:, 0] * dev_xs * dev_coefs
+        shoots[:, 1] *= dev_ys * dev_coefs
+        shoot_angles = np.deg2rad(actions[:, 0]) + np.arctan2(self._map.pin_y - self._ball_poses[:, 1],
+                                                              self._map.pin_x - self._ball_poses[:, 0])
+        cos_as = np.cos(shoot_angles)
+        sin_as = np.sin(shoot_angles)
+        new_ball_poses = np.stack([
+            self._ball_poses[:, 0] + cos_as * shoots[:, 0] - sin_as * shoots[:, 1],
+            self._ball_poses[:, 1] + sin_as * shoots[:, 0] + cos_as * shoots[:, 1]
+        ], axis=1)
+
+        # get landed pixel intensities
+        new_pixels = self._map.get_pixels_on(new_ball_poses)
+        unknown = ~self._map.area_known[new_pixels]
+        if np.any(unknown):
+            raise golf_env.GolfEnv.NoAreaInfoAssignedException(new_pixels[np.argmax(unknown)])
+
+        # get rewards, terminations, on land actions from area tables
+        dists_to_pin = np.linalg.norm(new_ball_poses - self._map.pin_pos, axis=1)
+        rewards = np.array([self._map.reward_func[p](d) for p, d in zip(new_pixels, dists_to_pin)], dtype=np.float64)
+        terminations = self._map.termination[new_pixels]
+        on_lands = self._map.on_land[new_pixels]
+
+        # when unavailable club is picked keep previous state with reward of -4
+        available = self._club_availabilities[np.arange(self._n), clubs] != 0
+        rewards[~available] = -4
+        terminations[~available] = False
+        moved = available & (on_lands != golf_env.GolfEnv.OnLandAction.ROLLBACK)
+
+        # move balls landed on shore areas to shore, roll back the ones with no landable pixel behind
+        on_shore = np.nonzero(moved & (on_lands == golf_env.GolfEnv.OnLandAction.SHORE))[0]
+        if len(on_shore) > 0:
+            shore_poses, found = self._map.get_shore_poses(new_ball_poses[on_shore])
+            new_ball_poses[on_shore] = shore_poses
+            new_pixels[on_shore] = self._map.get_pixels_on(shore_poses)
+            dists_to_pin[on_shore] = np.linalg.norm(shore_poses - self._map.pin_pos, axis=1)
+            moved[on_shore[~found]] = False
+
+        # update states of envs not rolled back
+        self._ball_poses[moved] = new_ball_poses[moved]
+        self._landed_pixels[moved] = new_pixels[moved]
+        self._dists_to_pin[moved] = dists_to_pin[moved]
+        self.__update_state_imgs(np.nonzero(moved)[0])
+
+        # terminate when max step limit is reached
+        terminations |= (0 < self._max_step_ns) & (self._max_step_ns <= self._step_ns)
+
+        self._last_step_rewards = rewards.copy()
+
+        return (self._state_imgs, self._dists_to_pin.copy(),
+                self._club_availabilities.copy()), rewards, terminations
+
+    def get_state_metadata(self):
+        return {
+            'dist_to_tee': np.linalg.norm(self._ball_poses - self._map.tee_pos, axis=1),
+            'last_step_reward': self._last_step_rewards.copy(),
+        }
+
+    def get_state_class_img(self):
+        """
+        state imgs with pixel intensities replaced by dense area class indices, e.g. for embedding layers
+        :return: uint8 imgs of class indices into get_area_class_names()
+        """
+        return self._map.area_class[self._state_imgs]
+
+    def get_area_class_names(self):
+        return tuple(self._map.area_class_names)
+
+    def get_config_args(self):
+        return self._map.args
+
+    def get_timestep(self):
+        return self._step_ns.copy()
+
+    def __sync_skill_model(self):
+        # rebuild the table when skill model has been replaced, resizing club availabilities to its club count
+        if self._skill_model is golf_env.GolfEnv.SKILL_MODEL:
+            return
+
+        self._skill_model = golf_env.GolfEnv.SKILL_MODEL
+        club_index = golf_env.GolfEnv.ClubInfoIndex
+        self._skill_model_table = np.array([
+            (club_info[club_index.DIST], club_info[club_index.DEV_X], club_info[club_index.DEV_Y])
+            for club_info in self._skill_model
+        ])
+        if self._club_availabilities.shape[1] != len(self._skill_model):
+            self._club_availabilities = np.ones((self._n, len(self._skill_model)))
+
+    def __update_state_imgs(self, indices):
+        # re-render imgs of envs at indices only, on a copy so imgs returned by previous calls stay untouched
+        state_imgs = self._map.generate_state_imgs(self._ball_poses[indices])
+        self._state_imgs = self._state_imgs.copy()
+        self._state_imgs[indices] = state_imgs